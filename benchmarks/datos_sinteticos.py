@@ -0,0 +1,133 @@
+"""Datos sintéticos para los benchmarks: un "Operation File" con la forma del real y un historial grande.
+
+El libro tiene la hoja General con las columnas que lee app.py (con los mismos encabezados
+desordenados del original, p. ej. 'Localidad  Destino ') más columnas que el tablero ignora. Las
+distribuciones de Canal/Cliente/Estatus imitan el archivo de producción: la mayoría de las filas
+ya están entregadas y sólo ~15 % siguen activas.
+
+Uso:
+    python benchmarks/datos_sinteticos.py libro.xlsx --filas 50000
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+import xlsxwriter
+
+# (canal tal como aparece en el Excel, peso, clientes del canal)
+CANALES = [
+    ('Walmart', 0.34, ['WALMART DE MEXICO', 'SAMS CLUB', 'BODEGA AURRERA']),
+    ('Autoservicio', 0.24, ['SORIANA', 'LA COMER', 'HEB', 'CITY MARKET']),
+    ('Chedraui', 0.18, ['CHEDRAUI SA DE CV', 'SUPERCHE']),
+    ('E-Commerce', 0.10, ['AMAZON MX', 'MERCADO LIBRE', 'LIVERPOOL']),
+    ('Mayoreo', 0.08, ['CASA LEY', 'ABARROTES DEL NORTE']),
+    ('Exportacion', 0.06, ['IMPORTADORA US']),
+]
+ESTATUS = [('Entregado', 0.80), ('Cancelado', 0.05), ('', 0.15)]
+ESTADOS_FINALES = [('Entregado', 0.82), ('En Ruta', 0.06), ('Cancelado', 0.07), ('Pendiente', 0.05)]
+LOCALIDADES = ['CDMX', 'Guadalajara', 'Monterrey', 'Puebla', 'Querétaro', 'Mérida', 'Tijuana', 'León', 'Toluca', 'Veracruz']
+HORARIOS = ['07:00', '08:00', '09:00', '10:00', '11:00', '12:00', '14:00', '16:00']
+ENCABEZADOS = ['Orden de compra', 'SO', 'Cliente', 'Canal', 'Factura', 'Fecha de entrega', 'Horario',
+               'Localidad  Destino ', 'No. Botellas', 'No. Cajas', 'Subtotal', 'Estatus', 'Transportista', 'Comentarios']
+
+
+def _variante_canal(rng, canal):
+    """El Excel real trae el canal con mayúsculas y espacios inconsistentes (app.py lo normaliza)."""
+    r = rng.random()
+    if r < 0.05:
+        return canal.lower() + ' '
+    if r < 0.10:
+        return canal.upper()
+    return canal
+
+
+def filas_workbook(filas, semilla=1, ronda=0, cambios=0.01):
+    """Genera las filas del libro. Cada `ronda` cambia el horario de ~`cambios` de las filas (siempre otras)."""
+    rng = random.Random(semilla)
+    pesos_canal = [c[1] for c in CANALES]
+    estatus, pesos_estatus = zip(*ESTATUS)
+    inicio = datetime(2026, 1, 1)
+    paso = max(int(round(1 / cambios)), 1) if cambios else 0
+    for i in range(filas):
+        canal, _, clientes = rng.choices(CANALES, weights=pesos_canal)[0]
+        botellas = rng.randint(6, 2400)
+        oc = f'OC{4500000000 + i}'
+        r = rng.random()
+        if r < 0.02:
+            oc = ''  # Sin OC: el tablero usa 'Remisión-{SO}'.
+        elif r < 0.025 and i:
+            oc = f'OC{4500000000 + i - 1}'  # OC repetida
+        horario = rng.choice(HORARIOS)
+        if paso and (i * 7919 + ronda) % paso == 0 and ronda:
+            horario = HORARIOS[(HORARIOS.index(horario) + ronda) % len(HORARIOS)]
+        yield [
+            oc, f'SO{700000 + i}', rng.choice(clientes), _variante_canal(rng, canal), f'F-{900000 + i}',
+            (inicio + timedelta(days=rng.randint(0, 330))).strftime('%d/%m/%Y'), horario,
+            rng.choice(LOCALIDADES), botellas, max(botellas // 12, 1), round(botellas * rng.uniform(80, 450), 2),
+            rng.choices(estatus, weights=pesos_estatus)[0], rng.choice(['Propio', 'Estafeta', 'DHL', 'Tres Guerras']),
+            'Cita confirmada' if rng.random() < 0.3 else '',
+        ]
+
+
+def generar_workbook(ruta, filas, semilla=1, ronda=0, cambios=0.01):
+    """Escribe el .xlsx (modo constant_memory de xlsxwriter: no guarda el libro entero en memoria)."""
+    libro = xlsxwriter.Workbook(ruta, {'constant_memory': True})
+    hoja = libro.add_worksheet('General')
+    hoja.write_row(0, 0, ENCABEZADOS)
+    for numero, fila in enumerate(filas_workbook(filas, semilla, ronda, cambios), start=1):
+        hoja.write_row(numero, 0, fila)
+    libro.close()
+    return ruta
+
+
+def filas_historial(filas, semilla=1, desde=None):
+    rng = random.Random(semilla)
+    pesos_canal = [c[1] for c in CANALES]
+    estados, pesos_estados = zip(*ESTADOS_FINALES)
+    desde = desde or datetime.utcnow() - timedelta(days=730)
+    segundos = 730 * 24 * 3600
+    for i in range(filas):
+        canal, _, clientes = rng.choices(CANALES, weights=pesos_canal)[0]
+        botellas = rng.randint(6, 2400)
+        yield {
+            'orden_compra': f'H{3000000000 + i}', 'cliente': rng.choice(clientes), 'canal': canal,
+            'so': f'SO{100000 + i}', 'factura': f'F-{200000 + i}',
+            'fecha_entrega': (desde + timedelta(days=rng.randint(0, 730))).strftime('%Y-%m-%d'),
+            'horario': rng.choice(HORARIOS), 'estado_final': rng.choices(estados, weights=pesos_estados)[0],
+            'fecha_archivado': desde + timedelta(seconds=rng.randint(0, segundos)),
+            'localidad_destino': rng.choice(LOCALIDADES), 'no_botellas': botellas,
+            'no_cajas': max(botellas // 12, 1), 'subtotal': round(botellas * rng.uniform(80, 450), 2),
+            'notas': rng.choice(['', '', '', 'Entrega parcial', 'Rechazo por caducidad', 'Cita reprogramada']),
+        }
+
+
+def poblar_historial(modulo_app, filas, lote=20000, semilla=1):
+    """Inserta `filas` órdenes en HistorialOrden por lotes y reconstruye el resumen.
+
+    Debe llamarse dentro de `modulo_app.app.app_context()`; devuelve cuántas filas insertó.
+    """
+    db, HistorialOrden = modulo_app.db, modulo_app.HistorialOrden
+    pendientes, insertadas = [], 0
+    for fila in filas_historial(filas, semilla):
+        pendientes.append(fila)
+        if len(pendientes) >= lote:
+            db.session.execute(db.insert(HistorialOrden), pendientes)
+            db.session.commit()
+            insertadas += len(pendientes)
+            pendientes = []
+    if pendientes:
+        db.session.execute(db.insert(HistorialOrden), pendientes)
+        db.session.commit()
+        insertadas += len(pendientes)
+    modulo_app.reconstruir_resumen_historial()
+    return insertadas
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('xlsx', help='Ruta del .xlsx a generar')
+    parser.add_argument('--filas', type=int, default=10000)
+    parser.add_argument('--semilla', type=int, default=1)
+    args = parser.parse_args()
+    generar_workbook(args.xlsx, args.filas, args.semilla)
+    print(f"✅ {args.filas} filas escritas en {args.xlsx}.")
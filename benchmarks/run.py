@@ -0,0 +1,260 @@
+"""Benchmarks sin conexión de los caminos calientes: sincronización, tablero, filtros del historial y exportación.
+
+Genera un "Operation File" sintético, lo sirve con fake_graph.py, llena el historial con filas
+sintéticas y mide cada escenario con la app real (DATA_DIR y BD propios en --directorio, así que no
+toca los datos de desarrollo). Por escenario reporta p50/p99/media en ms, operaciones por segundo,
+unidades (filas o bytes) por segundo y el pico de RSS del proceso hasta ese momento. Con --salida
+se guarda el resultado en JSON junto con el commit, para comparar con --comparar.
+
+Uso:
+    python benchmarks/run.py --filas-excel 50000 --filas-historial 1000000 --salida actual.json
+    python benchmarks/run.py --solo sync,historial --repeticiones 20
+    python benchmarks/run.py --comparar base.json actual.json
+
+--directorio conserva el libro y la BD entre corridas (el historial sólo se llena la primera vez).
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datos_sinteticos import generar_workbook, poblar_historial  # noqa: E402
+
+ESCENARIOS = ('sync', 'datos', 'historial', 'exportacion')
+FILTROS_HISTORIAL = {
+    'sin_filtros': {},
+    'canal': {'canal': 'Walmart'},
+    'cliente': {'cliente': 'SORIANA'},
+    'localidad': {'localidad': 'Monterrey'},
+    'texto': {'q': 'caducidad'},
+    'canal_fechas': {'canal': 'Chedraui', 'start_date': -90, 'end_date': 0},
+    'texto_canal_fechas': {'q': 'cita', 'canal': 'Autoservicio', 'start_date': -180, 'end_date': 0},
+    'orden_cliente': {'sort': 'cliente', 'canal': 'E-Commerce'},
+}
+_silencio = open(os.devnull, 'w')
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, max(int(round(p / 100 * len(ordenados) + 0.5)) - 1, 0))]
+
+
+def rss_pico_mb():
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024, 1)
+
+
+def medir(nombre, fn, repeticiones, preparar=None, calentamiento=1, unidad='filas'):
+    """Ejecuta fn() `repeticiones` veces (más el calentamiento); fn devuelve cuántas unidades procesó."""
+    tiempos, unidades = [], 0
+    for i in range(calentamiento + repeticiones):
+        if preparar:
+            preparar()
+        with contextlib.redirect_stdout(_silencio):
+            inicio = time.perf_counter()
+            procesadas = fn()
+            transcurrido = time.perf_counter() - inicio
+        if i >= calentamiento:
+            tiempos.append(transcurrido)
+            unidades += procesadas or 0
+    total = sum(tiempos)
+    resultado = {
+        'escenario': nombre, 'repeticiones': repeticiones,
+        'p50_ms': round(percentil(tiempos, 50) * 1000, 2), 'p99_ms': round(percentil(tiempos, 99) * 1000, 2),
+        'media_ms': round(total / len(tiempos) * 1000, 2), 'operaciones_s': round(len(tiempos) / total, 2),
+        'unidad': unidad, 'unidades_s': round(unidades / total, 1), 'rss_pico_mb': rss_pico_mb(),
+    }
+    print(f"{nombre:<34} p50 {resultado['p50_ms']:>9.2f} ms  p99 {resultado['p99_ms']:>9.2f} ms  "
+          f"{resultado['operaciones_s']:>8.2f} op/s  {resultado['unidades_s']:>12.1f} {unidad}/s  "
+          f"RSS {resultado['rss_pico_mb']:>7.1f} MB", flush=True)
+    return resultado
+
+
+def preparar_app(args):
+    """Genera el libro, arranca fake_graph e importa app.py apuntando a ellos (el orden importa:
+    app.py lee la configuración del entorno al importarse)."""
+    os.makedirs(args.directorio, exist_ok=True)
+    os.environ['DATA_DIR'] = os.path.join(args.directorio, 'data')
+    os.environ.setdefault('CLIENT_SECRET', 'benchmark')
+    os.environ['SYNC_BACKGROUND_ENABLED'] = '0'
+    os.environ.setdefault('SESSION_PRUNE_INTERVAL_SECONDS', '0')
+    xlsx = os.path.join(args.directorio, 'operation_file.xlsx')
+    if not os.path.exists(xlsx) or args.regenerar:
+        print(f"📝 Generando libro sintético de {args.filas_excel} filas...", flush=True)
+        generar_workbook(xlsx, args.filas_excel, args.semilla)
+    import fake_graph
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # Sin el log por petición del servidor falso.
+    graph_base_url, servidor = fake_graph.iniciar_en_segundo_plano(xlsx)
+    os.environ['GRAPH_BASE_URL'] = graph_base_url
+    with contextlib.redirect_stdout(_silencio):
+        import app as modulo_app
+    return modulo_app, xlsx, servidor
+
+
+def cliente_super(modulo_app):
+    with modulo_app.app.app_context():
+        usuario = modulo_app.User.query.filter_by(email='benchmark@local').first()
+        if usuario is None:
+            usuario = modulo_app.User(email='benchmark@local', nombre='Benchmark', rol='super')
+            modulo_app.db.session.add(usuario)
+            modulo_app.db.session.commit()
+        id_usuario = usuario.id
+    cliente = modulo_app.app.test_client()
+    with cliente.session_transaction() as sesion:
+        sesion['_user_id'] = str(id_usuario)
+        sesion['_fresh'] = True
+    return cliente
+
+
+def escenarios_sync(modulo_app, xlsx, args):
+    app = modulo_app.app
+    ronda = {'n': 0}
+
+    def sincronizar():
+        with app.app_context():
+            df, _ = modulo_app.sincronizar_y_obtener_datos_completos(access_token='benchmark')
+        return len(df)
+
+    def libro_modificado():
+        # Fuera del tiempo medido: otro ~1 % de las filas cambia y el archivo recibe un eTag nuevo.
+        ronda['n'] += 1
+        with contextlib.redirect_stdout(_silencio):
+            generar_workbook(xlsx, args.filas_excel, args.semilla, ronda=ronda['n'])
+
+    modulo_app.WORKBOOK_CACHE_TTL = 0
+    yield medir('sync/libro_modificado', sincronizar, max(args.repeticiones // 4, 3), preparar=libro_modificado)
+    yield medir('sync/etag_sin_cambios', sincronizar, args.repeticiones)
+    modulo_app.WORKBOOK_CACHE_TTL = 10 ** 9
+    yield medir('sync/cache_en_memoria', sincronizar, args.repeticiones)
+
+
+def escenarios_datos(modulo_app, cliente, args):
+    modulo_app.WORKBOOK_CACHE_TTL = 10 ** 9
+    with contextlib.redirect_stdout(_silencio):
+        version = cliente.get('/api/logistica/datos?canal=ALL').get_json()['version']
+
+    def pedir(url, **headers):
+        def fn():
+            respuesta = cliente.get(url, headers=headers)
+            assert respuesta.status_code == 200, respuesta.status_code
+            return len(respuesta.get_data())
+        return fn
+
+    yield medir('datos/completo', pedir('/api/logistica/datos?canal=ALL'), args.repeticiones, unidad='bytes')
+    yield medir('datos/completo_gzip', pedir('/api/logistica/datos?canal=ALL', **{'Accept-Encoding': 'gzip'}),
+                args.repeticiones, unidad='bytes')
+    yield medir('datos/un_canal', pedir('/api/logistica/datos?canal=Walmart'), args.repeticiones, unidad='bytes')
+    yield medir('datos/delta', pedir(f'/api/logistica/datos?canal=ALL&since={version}'), args.repeticiones, unidad='bytes')
+
+
+def _parametros(filtros):
+    hoy = datetime.utcnow().date()
+    return {k: (hoy + timedelta(days=v)).isoformat() if k.endswith('_date') else v for k, v in filtros.items()}
+
+
+def escenarios_historial(modulo_app, cliente, args):
+    for nombre, filtros in FILTROS_HISTORIAL.items():
+        parametros = {'limit': 50, 'include_total': 1, **_parametros(filtros)}
+
+        def fn(parametros=parametros):
+            respuesta = cliente.get('/api/historial', query_string=parametros)
+            assert respuesta.status_code == 200, respuesta.status_code
+            return len(respuesta.get_json()['data'])
+        yield medir(f'historial/{nombre}', fn, args.repeticiones)
+
+
+def escenarios_exportacion(modulo_app, cliente, args):
+    parametros = _parametros({'canal': 'Exportacion', 'start_date': -args.dias_exportacion, 'end_date': 0})
+    for formato in ('csv', 'ndjson', 'xlsx'):
+        def fn(formato=formato):
+            respuesta = cliente.get('/api/historial/descargar', query_string={**parametros, 'format': formato})
+            assert respuesta.status_code == 200, respuesta.status_code
+            return len(respuesta.get_data())
+        yield medir(f'exportacion/{formato}', fn, max(args.repeticiones // 4, 3), unidad='bytes')
+
+
+def comparar(base, actual):
+    with open(base, encoding='utf-8') as f:
+        anterior = {r['escenario']: r for r in json.load(f)['resultados']}
+    with open(actual, encoding='utf-8') as f:
+        datos = json.load(f)
+    print(f"{'escenario':<34} {'p50 antes':>10} {'p50 ahora':>10} {'cambio':>8}   {'RSS antes':>9} {'RSS ahora':>9}")
+    for r in datos['resultados']:
+        previo = anterior.get(r['escenario'])
+        if previo is None:
+            continue
+        cambio = (r['p50_ms'] / previo['p50_ms'] - 1) * 100 if previo['p50_ms'] else 0.0
+        print(f"{r['escenario']:<34} {previo['p50_ms']:>10.2f} {r['p50_ms']:>10.2f} {cambio:>+7.1f}%   "
+              f"{previo['rss_pico_mb']:>9.1f} {r['rss_pico_mb']:>9.1f}")
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas-excel', type=int, default=50000, help='Filas del Operation File sintético')
+    parser.add_argument('--filas-historial', type=int, default=1000000, help='Filas de HistorialOrden')
+    parser.add_argument('--repeticiones', type=int, default=20)
+    parser.add_argument('--dias-exportacion', type=int, default=90, help='Rango de fechas exportado')
+    parser.add_argument('--semilla', type=int, default=1)
+    parser.add_argument('--solo', help=f"Escenarios separados por coma ({', '.join(ESCENARIOS)})")
+    parser.add_argument('--directorio', help='Directorio de trabajo (por defecto, uno temporal)')
+    parser.add_argument('--regenerar', action='store_true', help='Vuelve a generar el libro aunque exista')
+    parser.add_argument('--salida', help='Archivo JSON con los resultados')
+    parser.add_argument('--comparar', nargs=2, metavar=('BASE', 'ACTUAL'), help='Compara dos resultados y termina')
+    args = parser.parse_args()
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+    args.directorio = args.directorio or tempfile.mkdtemp(prefix='bench-logistica-')
+    solo = set(args.solo.split(',')) if args.solo else set(ESCENARIOS)
+
+    modulo_app, xlsx, servidor = preparar_app(args)
+    cliente = cliente_super(modulo_app)
+    if solo & {'historial', 'exportacion'}:
+        with modulo_app.app.app_context():
+            existentes = modulo_app.HistorialOrden.query.count()
+            if existentes < args.filas_historial:
+                print(f"📝 Insertando {args.filas_historial - existentes} filas en el historial...", flush=True)
+                with contextlib.redirect_stdout(_silencio):
+                    poblar_historial(modulo_app, args.filas_historial - existentes, semilla=args.semilla + existentes)
+    print(f"Directorio: {args.directorio}  commit: {_commit_actual()}", flush=True)
+
+    resultados = []
+    if 'sync' in solo:
+        resultados += list(escenarios_sync(modulo_app, xlsx, args))
+    if 'datos' in solo:
+        resultados += list(escenarios_datos(modulo_app, cliente, args))
+    if 'historial' in solo:
+        resultados += list(escenarios_historial(modulo_app, cliente, args))
+    if 'exportacion' in solo:
+        resultados += list(escenarios_exportacion(modulo_app, cliente, args))
+    servidor.shutdown()
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump({'commit': _commit_actual(), 'fecha': datetime.now().isoformat(timespec='seconds'),
+                       'parametros': {k: v for k, v in vars(args).items() if k not in ('comparar', 'salida')},
+                       'resultados': resultados}, f, indent=2, ensure_ascii=False)
+        print(f"✅ Resultados guardados en {args.salida}.")
+
+
+if __name__ == '__main__':
+    main()
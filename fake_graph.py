@@ -0,0 +1,96 @@
+"""Servidor local que imita el flujo de Microsoft Graph que usa app.py para leer el Excel.
+
+Sirve `GET /v1.0/shares/<id>/driveItem` (con eTag/cTag/lastModifiedDateTime derivados del archivo
+y `@microsoft.graph.downloadUrl`) y la descarga del .xlsx, para probar la sincronización sin
+conexión. Se puede simular latencia y throttling (429 con Retry-After).
+
+Uso:
+    python fake_graph.py ruta/al/archivo.xlsx --port 5055 --throttle 2 --latency 0.2
+    GRAPH_BASE_URL=http://127.0.0.1:5055/v1.0 flask run
+"""
+import argparse
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import Flask, Response, abort, jsonify, request, send_file, url_for
+from werkzeug.serving import make_server
+
+
+def crear_app(xlsx_path, throttle=0, latency=0.0, retry_after=1):
+    """Crea la app falsa. `throttle` es cuántas peticiones por ruta responden 429 antes de servir."""
+    app = Flask(__name__)
+    estado = {'pendientes_429': {}, 'peticiones': {}, 'lock': threading.Lock()}
+
+    def _contar_y_limitar(ruta):
+        with estado['lock']:
+            estado['peticiones'][ruta] = estado['peticiones'].get(ruta, 0) + 1
+            pendientes = estado['pendientes_429'].setdefault(ruta, throttle)
+            if pendientes > 0:
+                estado['pendientes_429'][ruta] = pendientes - 1
+                return Response('{"error": {"code": "TooManyRequests"}}', status=429,
+                                headers={'Retry-After': str(retry_after)}, mimetype='application/json')
+        if latency:
+            time.sleep(latency)
+        return None
+
+    def _clave_archivo():
+        st = os.stat(xlsx_path)
+        digest = hashlib.sha1(f"{st.st_mtime_ns}-{st.st_size}".encode('utf-8')).hexdigest()
+        modificado = datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        return f'"{{{digest[:8]}}},{st.st_mtime_ns}"', f'"c:{{{digest[:8]}}},{st.st_size}"', modificado
+
+    @app.route('/v1.0/shares/<share_id>/driveItem')
+    def drive_item(share_id):
+        if not request.headers.get('Authorization', '').startswith('Bearer '):
+            abort(401)
+        limitada = _contar_y_limitar('driveItem')
+        if limitada is not None:
+            return limitada
+        etag, ctag, modificado = _clave_archivo()
+        return jsonify({
+            'id': share_id,
+            'name': os.path.basename(xlsx_path),
+            'size': os.path.getsize(xlsx_path),
+            'eTag': etag,
+            'cTag': ctag,
+            'lastModifiedDateTime': modificado,
+            '@microsoft.graph.downloadUrl': url_for('descargar', _external=True),
+        })
+
+    @app.route('/download')
+    def descargar():
+        limitada = _contar_y_limitar('download')
+        if limitada is not None:
+            return limitada
+        return send_file(xlsx_path, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+
+    @app.route('/_stats')
+    def stats():
+        with estado['lock']:
+            return jsonify(estado['peticiones'])
+
+    app.config['FAKE_GRAPH_ESTADO'] = estado
+    return app
+
+
+def iniciar_en_segundo_plano(xlsx_path, host='127.0.0.1', port=0, **kwargs):
+    """Arranca el servidor en un hilo; devuelve (GRAPH_BASE_URL, servidor). Detener con servidor.shutdown()."""
+    servidor = make_server(host, port, crear_app(xlsx_path, **kwargs), threaded=True)
+    threading.Thread(target=servidor.serve_forever, name='fake-graph', daemon=True).start()
+    return f"http://{host}:{servidor.server_port}/v1.0", servidor
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('xlsx', help='Archivo .xlsx con la hoja General')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--throttle', type=int, default=0, help='Respuestas 429 por ruta antes de servir')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=0.0, help='Segundos de espera por petición')
+    args = parser.parse_args()
+    crear_app(args.xlsx, throttle=args.throttle, latency=args.latency, retry_after=args.retry_after).run(
+        host=args.host, port=args.port, threaded=True)
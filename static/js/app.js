@@ -38,6 +38,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // --- ESTADO DE LA APLICACIÓN ---
     let fullData = [];
+    let dataVersion = null;
     let currentOrder = null;
     let selectedOrders = new Set();
     const CACHE_KEY_PREFIX = 'logisticaDataCache_';
@@ -382,10 +383,12 @@ document.addEventListener('DOMContentLoaded', () => {
         const cacheKeyChannel = channel || 'initial';
         const CACHE_KEY = `${CACHE_KEY_PREFIX}${cacheKeyChannel}`;
         
-        const processDataAndInitialize = (data) => {
+        const processDataAndInitialize = (data, version) => {
             data.forEach(order => order.Prioridad = calculatePriority(order['Fecha de entrega']));
             fullData = data;
+            dataVersion = version ?? null;
             sessionStorage.setItem(CACHE_KEY, JSON.stringify(fullData));
+            sessionStorage.setItem(`${CACHE_KEY}_version`, JSON.stringify(dataVersion));
             initializeUI(fullData);
         };
 
@@ -394,7 +397,7 @@ document.addEventListener('DOMContentLoaded', () => {
             if (cachedData) {
                 console.log("Datos cargados desde la caché. ¡Navegación instantánea!");
                 const data = JSON.parse(cachedData);
-                processDataAndInitialize(data);
+                processDataAndInitialize(data, JSON.parse(sessionStorage.getItem(`${CACHE_KEY}_version`)));
                 document.getElementById('app-loader').classList.add('d-none');
                 document.getElementById('app-container').classList.remove('d-none');
                 return;
@@ -417,7 +420,7 @@ document.addEventListener('DOMContentLoaded', () => {
             channelFilter.value = responseData.loaded_channel;
             selectedOrders.clear();
             updateGroupButtonState();
-            processDataAndInitialize(responseData.data);
+            processDataAndInitialize(responseData.data, responseData.version);
             document.getElementById('app-loader').classList.add('d-none');
             document.getElementById('app-container').classList.remove('d-none');
         } catch (error) {
@@ -429,6 +432,61 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     };
 
+    // Pide sólo las órdenes que cambiaron desde la última versión recibida y las aplica sobre fullData.
+    const fetchDelta = async (channel = null) => {
+        if (dataVersion === null) return fetchData(true, channel);
+        loadingSpinner.classList.remove('d-none');
+        try {
+            const params = new URLSearchParams({ since: dataVersion });
+            if (channel) params.append('canal', channel);
+            const response = await fetch(`/api/logistica/datos?${params.toString()}`);
+            if (!response.ok) throw new Error('Error del servidor');
+            const delta = await response.json();
+            if (!delta.upserted || delta.loaded_channel !== (channelFilter.value || delta.loaded_channel)) {
+                return fetchData(true, channel);
+            }
+            const removed = new Set(delta.removed);
+            delta.upserted.forEach(order => removed.add(order['Orden de compra']));
+            fullData = fullData.filter(order => !removed.has(order['Orden de compra']));
+            delta.upserted.forEach(order => {
+                order.Prioridad = calculatePriority(order['Fecha de entrega']);
+                fullData.push(order);
+            });
+            delta.removed.forEach(oc => selectedOrders.delete(oc));
+            dataVersion = delta.version;
+            const cacheKey = `${CACHE_KEY_PREFIX}${channel || 'initial'}`;
+            sessionStorage.setItem(cacheKey, JSON.stringify(fullData));
+            sessionStorage.setItem(`${cacheKey}_version`, JSON.stringify(dataVersion));
+            updateGroupButtonState();
+            initializeUI(fullData);
+        } catch (error) {
+            console.error("Error al actualizar los datos:", error);
+            return fetchData(true, channel);
+        } finally {
+            loadingSpinner.classList.add('d-none');
+        }
+    };
+
+    // Actualizaciones en vivo: cada evento del servidor dispara un delta (agrupados en 300 ms).
+    const LIVE_EVENT_TYPES = ['estado', 'notas', 'tarea', 'bloque', 'desagrupado', 'archivado', 'liberado', 'sincronizacion', 'resync'];
+    let liveDeltaTimer = null;
+    const scheduleDelta = () => {
+        clearTimeout(liveDeltaTimer);
+        liveDeltaTimer = setTimeout(() => fetchDelta(channelFilter.value || null), 300);
+    };
+    const connectLiveUpdates = () => {
+        if (!window.EventSource) return;
+        const source = new EventSource('/api/eventos');
+        LIVE_EVENT_TYPES.forEach(type => source.addEventListener(type, (e) => {
+            const event = e.data ? JSON.parse(e.data) : {};
+            const loadedChannel = channelFilter.value;
+            if (event.canales && loadedChannel && loadedChannel !== 'ALL' && !event.canales.includes(loadedChannel)) return;
+            scheduleDelta();
+        }));
+        // Al reconectar pudieron perderse eventos: se pide el delta desde la última versión conocida.
+        source.addEventListener('hola', () => { if (dataVersion !== null) scheduleDelta(); });
+    };
+
     const initializeApp = async () => {
         // Limpia cualquier caché de datos de una sesión o usuario anterior.
         // Esto asegura que cada usuario empiece desde cero.
@@ -467,7 +525,8 @@ document.addEventListener('DOMContentLoaded', () => {
             }
 
             updateGroupButtonState();
-            fetchData();
+            await fetchData();
+            connectLiveUpdates();
         } catch (error) {
             console.warn('Usuario no autenticado, mostrando pantalla de login.');
             document.getElementById('app-loader').classList.add('d-none');
@@ -529,27 +588,36 @@ document.addEventListener('DOMContentLoaded', () => {
                 const response = await saveData('/api/desagrupar-bloque', { ocs: ocsToUngroup });
                 if (response && response.success) {
                     Swal.fire('¡Éxito!', 'Las órdenes han sido desagrupadas.', 'success');
-                    fetchData(true, channelFilter.value || 'ALL');
+                    fetchDelta(channelFilter.value || 'ALL');
                 }
             }
         });
     };
 
-    const cargarHistorial = async () => {
+    const HISTORY_PAGE_SIZE = 100;
+    let historyNextCursor = null;
+
+    const cargarHistorial = async (append = false) => {
         const cliente = document.getElementById('history-filter-cliente').value;
         const startDate = document.getElementById('history-filter-start-date').value;
         const endDate = document.getElementById('history-filter-end-date').value;
         const localidad = document.getElementById('history-filter-localidad').value;
         const canal = document.getElementById('history-filter-canal').value;
-        const params = new URLSearchParams({ cliente, start_date: startDate, end_date: endDate, localidad, canal });
+        const q = document.getElementById('history-filter-q').value.trim();
+        const params = new URLSearchParams({ q, cliente, start_date: startDate, end_date: endDate, localidad, canal, limit: HISTORY_PAGE_SIZE });
+        if (append && historyNextCursor) params.append('cursor', historyNextCursor);
         const tableBody = document.getElementById('table-body-history');
-        tableBody.innerHTML = `<tr><td colspan="5" class="text-center py-4">Cargando historial...</td></tr>`;
+        const loadMoreRow = document.getElementById('history-load-more-row');
+        if (loadMoreRow) loadMoreRow.remove();
+        if (!append) tableBody.innerHTML = `<tr><td colspan="5" class="text-center py-4">Cargando historial...</td></tr>`;
         try {
             const response = await fetch(`/api/historial?${params.toString()}`);
             if (!response.ok) throw new Error('No se pudo cargar el historial');
-            const historyData = await response.json();
-            tableBody.innerHTML = '';
-            if (historyData.length === 0) {
+            const page = await response.json();
+            const historyData = page.data;
+            historyNextCursor = page.next_cursor;
+            if (!append) tableBody.innerHTML = '';
+            if (!append && historyData.length === 0) {
                 tableBody.innerHTML = `<tr><td colspan="5" class="text-center py-4">No se encontraron registros.</td></tr>`;
                 return;
             }
@@ -557,6 +625,13 @@ document.addEventListener('DOMContentLoaded', () => {
                 const tr = renderTableRow(row, true);
                 tableBody.appendChild(tr);
             });
+            if (historyNextCursor) {
+                const tr = document.createElement('tr');
+                tr.id = 'history-load-more-row';
+                tr.innerHTML = `<td colspan="5" class="text-center py-2"><button class="btn btn-sm btn-outline-secondary" id="history-load-more-btn">Cargar más</button></td>`;
+                tableBody.appendChild(tr);
+                tr.querySelector('button').addEventListener('click', () => cargarHistorial(true));
+            }
         } catch (error) {
             console.error("Error al cargar el historial:", error);
             tableBody.innerHTML = `<tr><td colspan="5" class="text-center py-4 text-danger">Error al cargar el historial.</td></tr>`;
@@ -574,7 +649,7 @@ document.addEventListener('DOMContentLoaded', () => {
     });
     if (refreshBtn) refreshBtn.addEventListener('click', () => {
         const currentChannel = channelFilter.value || null;
-        fetchData(true, currentChannel);
+        fetchDelta(currentChannel);
     });
     const navTabContent = document.getElementById('nav-tabContent');
     if (navTabContent) {
@@ -599,7 +674,7 @@ document.addEventListener('DOMContentLoaded', () => {
                         if (result.success) {
                             alert('¡Orden restaurada!');
                             releaseBtn.closest('tr').remove();
-                            fetchData(true, channelFilter.value || 'ALL');
+                            fetchDelta(channelFilter.value || 'ALL');
                         } else {
                             alert(`Error: ${result.error || 'No se pudo restaurar la orden.'}`);
                         }
@@ -660,12 +735,28 @@ document.addEventListener('DOMContentLoaded', () => {
             alert('Notas guardadas.');
         }
     });
+    // Los cambios de checklist se acumulan y se envían juntos a /api/lote (una sola transacción).
+    const pendingTaskOps = new Map();
+    let taskFlushTimer = null;
+    const flushTaskOps = async () => {
+        if (pendingTaskOps.size === 0) return;
+        const operaciones = [...pendingTaskOps.entries()].map(([tarea_id, completado]) => ({ op: 'tarea', tarea_id, completado }));
+        pendingTaskOps.clear();
+        const result = await saveData('/api/lote', { operaciones });
+        if (result && !result.success) {
+            const fallidas = result.resultados.filter(r => !r.ok).map(r => r.error);
+            alert(`Algunas tareas no se guardaron: ${fallidas.join(', ')}`);
+            fetchDelta(channelFilter.value || null);
+        }
+    };
     const checklistContainer = document.getElementById('modal-checklist-container');
-    if(checklistContainer) checklistContainer.addEventListener('change', async (e) => {
+    if(checklistContainer) checklistContainer.addEventListener('change', (e) => {
         if (e.target.matches('.form-check-input')) {
             const tareaId = parseInt(e.target.dataset.taskId);
             const completado = e.target.checked;
-            await saveData('/api/actualizar-tarea', { tarea_id: tareaId, completado: completado });
+            pendingTaskOps.set(tareaId, completado);
+            clearTimeout(taskFlushTimer);
+            taskFlushTimer = setTimeout(flushTaskOps, 400);
             const cachedOrder = fullData.find(o => o['Orden de compra'] === currentOrder['Orden de compra']);
             if (cachedOrder) {
                 const tarea = cachedOrder.Tareas.find(t => t.id === tareaId);
@@ -677,6 +768,8 @@ document.addEventListener('DOMContentLoaded', () => {
     const detailsModalEl = document.getElementById('detailsModal');
     if (detailsModalEl) {
         detailsModalEl.addEventListener('hidden.bs.modal', () => {
+            clearTimeout(taskFlushTimer);
+            flushTaskOps();
             document.body.focus();
         });
         detailsModalEl.addEventListener('click', async (e) => {
@@ -745,7 +838,9 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
     const historyFilterBtn = document.getElementById('history-filter-btn');
-    if(historyFilterBtn) historyFilterBtn.addEventListener('click', cargarHistorial);
+    if(historyFilterBtn) historyFilterBtn.addEventListener('click', () => cargarHistorial());
+    const historySearchInput = document.getElementById('history-filter-q');
+    if(historySearchInput) historySearchInput.addEventListener('keydown', (e) => { if (e.key === 'Enter') cargarHistorial(); });
     const historyDownloadBtn = document.getElementById('history-download-btn');
     if(historyDownloadBtn) {
         historyDownloadBtn.addEventListener('click', () => {
@@ -754,7 +849,8 @@ document.addEventListener('DOMContentLoaded', () => {
             const endDate = document.getElementById('history-filter-end-date').value;
             const localidad = document.getElementById('history-filter-localidad').value;
             const canal = document.getElementById('history-filter-canal').value;
-            const params = new URLSearchParams({ cliente, start_date: startDate, end_date: endDate, localidad, canal });
+            const q = document.getElementById('history-filter-q').value.trim();
+            const params = new URLSearchParams({ q, cliente, start_date: startDate, end_date: endDate, localidad, canal });
             window.location.href = `/api/historial/descargar?${params.toString()}`;
         });
     }
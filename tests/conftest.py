@@ -0,0 +1,100 @@
+"""Fixtures de las pruebas: la app real contra un SQLite temporal y un Graph falso (fake_graph.py).
+
+app.py lee la configuración del entorno al importarse, así que el entorno se prepara aquí y la app
+se importa una sola vez por sesión. El libro de Excel es el sintético de los benchmarks; con
+WORKBOOK_CACHE_TTL=0 cada petición revalida el eTag, y reescribir el libro es "cambiar el Excel".
+"""
+import contextlib
+import io
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+from datos_sinteticos import filas_workbook, generar_workbook  # noqa: E402
+
+DIRECTORIO = tempfile.mkdtemp(prefix='logistica-pruebas-')
+LIBRO = os.path.join(DIRECTORIO, 'operation_file.xlsx')
+FILAS_LIBRO = 600
+
+os.environ['DATA_DIR'] = os.path.join(DIRECTORIO, 'data')
+os.environ.pop('DATABASE_URL', None)
+os.environ.setdefault('CLIENT_SECRET', 'pruebas')
+os.environ['SYNC_BACKGROUND_ENABLED'] = '0'
+os.environ['SESSION_PRUNE_INTERVAL_SECONDS'] = '0'
+os.environ['WORKBOOK_CACHE_TTL'] = '0'
+os.environ['METRICS_ENABLED'] = '0'
+
+
+@pytest.fixture(scope='session')
+def modulo_app():
+    generar_workbook(LIBRO, FILAS_LIBRO)
+    import fake_graph
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    graph_base_url, servidor = fake_graph.iniciar_en_segundo_plano(LIBRO)
+    os.environ['GRAPH_BASE_URL'] = graph_base_url
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as modulo
+    # Sin inicio de sesión de Microsoft: fake_graph sólo exige un encabezado Bearer.
+    parche = pytest.MonkeyPatch()
+    parche.setattr(modulo, '_obtener_token_usuario', lambda: 'pruebas')
+    yield modulo
+    parche.undo()
+    servidor.shutdown()
+    shutil.rmtree(DIRECTORIO, ignore_errors=True)
+
+
+@pytest.fixture
+def crear_cliente(modulo_app):
+    """Devuelve un test client con sesión iniciada para el usuario `email` (se crea si no existe)."""
+    def crear(email='super@pruebas.local', rol='super', permisos=(), canales=()):
+        A = modulo_app
+        with A.app.app_context():
+            usuario = A.User.query.filter_by(email=email).first()
+            if usuario is None:
+                usuario = A.User(email=email, nombre=email.split('@')[0], rol=rol)
+                A.db.session.add(usuario)
+            usuario.permissions = A.Permission.query.filter(A.Permission.name.in_(list(permisos))).all()
+            usuario.allowed_channels = A.Channel.query.filter(A.Channel.name.in_(list(canales))).all()
+            A.db.session.commit()
+            id_usuario = usuario.id
+        A.invalidar_principales()
+        cliente = A.app.test_client()
+        with cliente.session_transaction() as sesion:
+            sesion['_user_id'] = str(id_usuario)
+            sesion['_fresh'] = True
+        return cliente
+    return crear
+
+
+@pytest.fixture
+def cliente(crear_cliente):
+    return crear_cliente()
+
+
+@pytest.fixture
+def reescribir_libro(modulo_app):
+    """Reescribe el Excel con la `ronda` dada (cambia el horario de ~2 % de las filas); al terminar
+    la prueba lo deja como al inicio."""
+    def reescribir(ronda):
+        generar_workbook(LIBRO, FILAS_LIBRO, ronda=ronda, cambios=0.02)
+        return list(filas_workbook(FILAS_LIBRO, ronda=ronda, cambios=0.02))
+    yield reescribir
+    generar_workbook(LIBRO, FILAS_LIBRO)
+
+
+@pytest.fixture
+def ordenes_activas(cliente):
+    """Filas del tablero (GET /api/logistica/datos) por orden de compra."""
+    def leer():
+        respuesta = cliente.get('/api/logistica/datos')
+        assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+        return {fila['Orden de compra']: fila for fila in respuesta.get_json()['data']}
+    return leer
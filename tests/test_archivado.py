@@ -0,0 +1,89 @@
+"""Archivado en bloque (_archivar_ordenes vía /api/archivar-bloque y /api/archivar-orden) y liberación."""
+import sqlalchemy as sa
+
+
+def _contar(modulo_app, modelo, *condiciones):
+    with modulo_app.app.app_context():
+        return modulo_app.db.session.scalar(sa.select(sa.func.count()).select_from(modelo).where(*condiciones))
+
+
+def _agrupar(cliente, ocs):
+    respuesta = cliente.post('/api/crear-bloque', json={'ordenes_compra': ocs})
+    assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+    return respuesta.get_json()['bloque_id']
+
+
+def test_archivar_bloque_completo(modulo_app, cliente, ordenes_activas):
+    A = modulo_app
+    activas = ordenes_activas()
+    ocs = sorted(activas)[2:5]
+    bloque_id = _agrupar(cliente, ocs)
+    ordenes = [{**activas[oc], 'Estado': 'Entregado'} for oc in ocs]
+    respuesta = cliente.post('/api/archivar-bloque', json={'orders_data': ordenes + [{'Cliente': 'sin OC'}, ordenes[0]]})
+    assert respuesta.status_code == 200
+    resultados = respuesta.get_json()['resultados']
+    assert [r['ok'] for r in resultados] == [True, True, True, False, False]
+    assert all(r['seguimiento_eliminado'] for r in resultados[:3])
+
+    assert _contar(A, A.Seguimiento, A.Seguimiento.orden_compra.in_(ocs)) == 0
+    assert _contar(A, A.Tarea, A.Tarea.seguimiento_oc.in_(ocs)) == 0
+    assert _contar(A, A.Bloque, A.Bloque.id == bloque_id) == 0
+    assert _contar(A, A.OrdenEliminada, A.OrdenEliminada.orden_compra.in_(ocs)) == 3
+    with A.app.app_context():
+        archivadas = {h.orden_compra: h for h in A.HistorialOrden.query.filter(A.HistorialOrden.orden_compra.in_(ocs))}
+    assert set(archivadas) == set(ocs)
+    fila = archivadas[ocs[0]]
+    assert (fila.cliente, fila.canal, fila.estado_final) == (activas[ocs[0]]['Cliente'], activas[ocs[0]]['Canal'], 'Entregado')
+    assert fila.fecha_archivado is not None
+    assert not set(ocs) & set(ordenes_activas())
+
+
+def test_archivar_parte_de_un_bloque_lo_conserva(modulo_app, cliente, ordenes_activas):
+    A = modulo_app
+    activas = ordenes_activas()
+    ocs = sorted(activas)[5:8]
+    bloque_id = _agrupar(cliente, ocs)
+    respuesta = cliente.post('/api/archivar-orden', json={**activas[ocs[0]], 'Estado': 'Entregado'})
+    assert respuesta.status_code == 200 and respuesta.get_json()['resultado']['seguimiento_eliminado']
+    assert _contar(A, A.Bloque, A.Bloque.id == bloque_id) == 1
+    assert _contar(A, A.Seguimiento, A.Seguimiento.bloque_id == bloque_id) == 2
+
+
+def test_archivar_orden_que_no_esta_activa(modulo_app, cliente):
+    respuesta = cliente.post('/api/archivar-orden', json={'Orden de compra': 'SOLO-HISTORIAL', 'Cliente': 'HEB',
+                                                           'Canal': 'Autoservicio', 'Estado': 'Cancelado'})
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()['resultado']['seguimiento_eliminado'] is False
+    assert _contar(modulo_app, modulo_app.HistorialOrden, modulo_app.HistorialOrden.orden_compra == 'SOLO-HISTORIAL') == 1
+    assert _contar(modulo_app, modulo_app.OrdenEliminada, modulo_app.OrdenEliminada.orden_compra == 'SOLO-HISTORIAL') == 0
+
+
+def test_valor_invalido_no_archiva(modulo_app, cliente, ordenes_activas):
+    activas = ordenes_activas()
+    oc = sorted(activas)[8]
+    respuesta = cliente.post('/api/archivar-orden', json={**activas[oc], 'No. Botellas': 'muchas'})
+    assert respuesta.status_code == 400
+    assert oc in ordenes_activas()
+    assert _contar(modulo_app, modulo_app.HistorialOrden, modulo_app.HistorialOrden.orden_compra == oc) == 0
+
+
+def test_liberar_devuelve_la_orden_al_tablero(modulo_app, cliente, ordenes_activas):
+    A = modulo_app
+    activas = ordenes_activas()
+    oc = sorted(activas)[9]
+    assert cliente.post('/api/archivar-orden', json={**activas[oc], 'Estado': 'Entregado'}).status_code == 200
+    with A.app.app_context():
+        historial_id = A.HistorialOrden.query.filter_by(orden_compra=oc).one().id
+    assert cliente.post(f'/api/orden/liberar/{historial_id}').status_code == 200
+    restaurada = ordenes_activas()[oc]
+    assert restaurada['Estado'] == 'Entregado' and restaurada['Tareas']
+    assert _contar(A, A.HistorialOrden, A.HistorialOrden.id == historial_id) == 0
+
+
+def test_archivar_requiere_permiso(modulo_app, crear_cliente, ordenes_activas):
+    activas = ordenes_activas()
+    oc = sorted(activas)[10]
+    usuario = crear_cliente('archivo@pruebas.local', rol='normal', permisos=['update_status'])
+    assert usuario.post('/api/archivar-orden', json=activas[oc]).status_code == 403
+    assert usuario.post('/api/archivar-bloque', json={'orders_data': [activas[oc]]}).status_code == 403
+    assert oc in ordenes_activas()
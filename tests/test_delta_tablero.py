@@ -0,0 +1,90 @@
+"""Delta del tablero (/api/logistica/datos?since=): cambios del seguimiento, del Excel y lápidas."""
+CANAL_USUARIO = 'Walmart'
+
+
+def _leer(cliente, **parametros):
+    respuesta = cliente.get('/api/logistica/datos', query_string=parametros)
+    assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+    return respuesta.get_json()
+
+
+def _version(cliente):
+    # La primera lectura de la sesión puede sincronizar después de leer la versión; la segunda ya no.
+    _leer(cliente)
+    return _leer(cliente)['version']
+
+
+def _delta(cliente, since, **parametros):
+    return _leer(cliente, since=since, **parametros)
+
+
+def test_sin_cambios_el_delta_esta_vacio(cliente):
+    version = _version(cliente)
+    delta = _delta(cliente, version)
+    assert delta['since'] == version and delta['version'] == version
+    assert delta['upserted'] == [] and delta['removed'] == []
+    assert 'data' not in delta
+
+
+def test_since_mayor_que_la_version_devuelve_todo(cliente):
+    version = _version(cliente)
+    respuesta = _delta(cliente, version + 1000)
+    assert 'data' in respuesta and 'upserted' not in respuesta
+
+
+def test_cambio_de_estado_aparece_en_el_delta(cliente, ordenes_activas):
+    oc = sorted(ordenes_activas())[0]
+    version = _version(cliente)
+    assert cliente.post('/api/actualizar-estado', json={'orden_compra': oc, 'nuevo_estado': 'En Ruta'}).status_code == 200
+    delta = _delta(cliente, version)
+    assert delta['version'] > version
+    assert [fila['Orden de compra'] for fila in delta['upserted']] == [oc]
+    assert delta['upserted'][0]['Estado'] == 'En Ruta'
+    assert _delta(cliente, delta['version'])['upserted'] == []
+
+
+def test_archivar_deja_lapida(cliente, ordenes_activas):
+    activas = ordenes_activas()
+    oc = sorted(activas)[1]
+    version = _version(cliente)
+    respuesta = cliente.post('/api/archivar-orden', json={**activas[oc], 'Estado': 'Entregado'})
+    assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+    delta = _delta(cliente, version)
+    assert oc in delta['removed']
+    assert oc not in [fila['Orden de compra'] for fila in delta['upserted']]
+    assert oc not in ordenes_activas()
+    # La lápida sigue valiendo para quien se quedó en una versión anterior, pero no después.
+    assert oc in _delta(cliente, version - 1)['removed']
+    assert oc not in _delta(cliente, delta['version'])['removed']
+
+
+def test_cambios_en_el_excel_aparecen_en_el_delta(cliente, ordenes_activas, reescribir_libro):
+    antes = ordenes_activas()
+    version = _version(cliente)
+    filas = reescribir_libro(1)
+    # Primera fila activa de cada OC (las repetidas se descartan), como en _sincronizar_seguimientos.
+    horarios = {}
+    for fila in filas:
+        oc = str(fila[0]).strip()
+        if oc and fila[11] == '':
+            horarios.setdefault(oc, fila[6])
+    esperadas = {oc for oc in antes if oc in horarios and horarios[oc] != antes[oc]['Horario']}
+    assert esperadas
+    delta = _delta(cliente, version)
+    assert {fila['Orden de compra'] for fila in delta['upserted']} == esperadas
+    assert all(fila['Horario'] == horarios[fila['Orden de compra']] for fila in delta['upserted'])
+    assert delta['removed'] == []
+
+
+def test_delta_respeta_los_canales_del_usuario(cliente, crear_cliente, ordenes_activas):
+    canal = CANAL_USUARIO
+    activas = ordenes_activas()
+    propia = sorted(oc for oc, fila in activas.items() if fila['Canal'] == canal)[0]
+    ajena = sorted(oc for oc, fila in activas.items() if fila['Canal'] not in (canal, None))[0]
+    usuario = crear_cliente('canal@pruebas.local', rol='normal', permisos=['update_status'], canales=[canal])
+    version = _version(usuario)
+    for oc in (propia, ajena):
+        assert cliente.post('/api/actualizar-estado', json={'orden_compra': oc, 'nuevo_estado': 'Revisar'}).status_code == 200
+    delta = _delta(usuario, version)
+    assert [fila['Orden de compra'] for fila in delta['upserted']] == [propia]
+    assert all(fila['Canal'] == canal for fila in delta['upserted'])
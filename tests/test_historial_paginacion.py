@@ -0,0 +1,118 @@
+"""Paginación por cursor de /api/historial: cada orden recorre todas las filas una sola vez."""
+from datetime import datetime, timedelta
+
+import pytest
+import sqlalchemy as sa
+
+ORDENES = ['fecha_archivado', '-fecha_archivado', 'cliente', '-cliente', 'canal', '-canal']
+CLIENTES = ['SORIANA', 'HEB', 'AMAZON MX', None]
+CANALES = ['Walmart', 'Chedraui', None]
+
+
+@pytest.fixture(scope='module')
+def historial(modulo_app):
+    """250 órdenes con empates en cliente, canal y fecha, y con cliente/canal en NULL."""
+    A = modulo_app
+    inicio = datetime(2026, 1, 1)
+    filas = [{
+        'orden_compra': f'PAG{i:04d}', 'cliente': CLIENTES[i % len(CLIENTES)], 'canal': CANALES[i % len(CANALES)],
+        'estado_final': 'Entregado', 'notas': 'cita' if i % 5 == 0 else '',
+        'fecha_archivado': inicio + timedelta(hours=i // 3),
+    } for i in range(250)]
+    with A.app.app_context():
+        A.db.session.execute(A.db.insert(A.HistorialOrden), filas)
+        A.db.session.commit()
+    yield
+    with A.app.app_context():
+        A.db.session.execute(sa.delete(A.HistorialOrden).where(A.HistorialOrden.orden_compra.like('PAG%')))
+        A.db.session.commit()
+
+
+def _esperado(modulo_app, orden):
+    """Ids en el orden documentado: (valor, id) en el sentido pedido y los NULL al final, por id."""
+    A = modulo_app
+    campo, descendente = orden.lstrip('-'), orden.startswith('-')
+    with A.app.app_context():
+        filas = A.db.session.execute(sa.select(A.HistorialOrden.id, getattr(A.HistorialOrden, campo))).all()
+    con_valor = sorted((f for f in filas if f[1] is not None), key=lambda f: (f[1], f[0]), reverse=descendente)
+    nulos = sorted((f for f in filas if f[1] is None), key=lambda f: f[0], reverse=descendente)
+    return [f[0] for f in con_valor + nulos]
+
+
+def _recorrer(cliente, parametros):
+    ids, cursor = [], None
+    while True:
+        url = f'/api/historial?{parametros}' + (f'&cursor={cursor}' if cursor else '')
+        respuesta = cliente.get(url)
+        assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+        pagina = respuesta.get_json()
+        ids += [fila['id'] for fila in pagina['data']]
+        cursor = pagina['next_cursor']
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize('limite', [7, 50])
+@pytest.mark.parametrize('orden', ORDENES)
+def test_paginas_sin_duplicados_ni_huecos(modulo_app, historial, cliente, orden, limite):
+    ids = _recorrer(cliente, f'limit={limite}&sort={orden}')
+    assert len(ids) == len(set(ids))
+    assert ids == _esperado(modulo_app, orden)
+    completa = cliente.get(f'/api/historial?sort={orden}').get_json()
+    assert [fila['id'] for fila in completa] == ids
+
+
+def test_paginas_con_filtro_de_canal(modulo_app, historial, cliente):
+    ids = _recorrer(cliente, 'limit=9&sort=-fecha_archivado&canal=Chedraui')
+    with modulo_app.app.app_context():
+        esperados = modulo_app.db.session.execute(
+            sa.select(modulo_app.HistorialOrden.id).where(modulo_app.HistorialOrden.canal == 'Chedraui')).scalars().all()
+    assert sorted(ids) == sorted(esperados) and len(ids) == len(set(ids))
+
+
+def test_paginas_con_busqueda(historial, cliente):
+    ids = _recorrer(cliente, 'limit=6&q=cita')
+    completa = cliente.get('/api/historial?q=cita').get_json()
+    assert len(ids) == len(set(ids))
+    assert sorted(ids) == sorted(fila['id'] for fila in completa)
+
+
+def test_total_y_limite(historial, cliente):
+    pagina = cliente.get('/api/historial?limit=10&include_total=1&canal=Walmart').get_json()
+    assert len(pagina['data']) == 10 and pagina['limit'] == 10
+    assert pagina['total'] == len(cliente.get('/api/historial?canal=Walmart').get_json())
+
+
+def test_cursor_y_orden_invalidos(historial, cliente):
+    assert cliente.get('/api/historial?limit=5&cursor=no-es-un-cursor').status_code == 400
+    assert cliente.get('/api/historial?limit=5&sort=so').status_code == 400
+    assert cliente.get('/api/historial?limit=5&sort=relevancia').status_code == 400
+
+
+@pytest.mark.parametrize('orden', ORDENES)
+def test_paginas_buscan_por_indice(modulo_app, historial, cliente, orden):
+    """Ninguna consulta de una página intermedia recorre la tabla entera (SCAN) en SQLite."""
+    A = modulo_app
+    if not A.DATABASE_URL.startswith('sqlite'):
+        pytest.skip('EXPLAIN QUERY PLAN es de SQLite')
+    primera = cliente.get(f'/api/historial?limit=20&sort={orden}').get_json()
+    consultas = []
+
+    def capturar(conexion, cursor, sentencia, parametros, contexto, executemany):
+        if 'FROM historial_orden' in sentencia and 'LIMIT' in sentencia:
+            consultas.append((sentencia, parametros))
+
+    sa.event.listen(sa.engine.Engine, 'before_cursor_execute', capturar)
+    try:
+        cliente.get(f'/api/historial?limit=20&sort={orden}&cursor={primera["next_cursor"]}')
+    finally:
+        sa.event.remove(sa.engine.Engine, 'before_cursor_execute', capturar)
+    assert consultas
+    with A.app.app_context():
+        conexion = A.db.engine.raw_connection()
+        try:
+            for sentencia, parametros in consultas:
+                plan = ' | '.join(paso[3] for paso in conexion.execute(f'EXPLAIN QUERY PLAN {sentencia}', parametros))
+                assert 'SCAN historial_orden' not in plan and 'TEMP B-TREE' not in plan, plan
+        finally:
+            conexion.close()
@@ -0,0 +1,98 @@
+"""Operaciones en lote (/api/lote): un resultado por operación, permisos por tipo y modo atómico."""
+
+
+def _seguimiento(modulo_app, oc):
+    with modulo_app.app.app_context():
+        return modulo_app.Seguimiento.query.filter_by(orden_compra=oc).one()
+
+
+def _resultados(respuesta):
+    return {r['indice']: r for r in respuesta.get_json()['resultados']}
+
+
+def test_lote_mixto_aplica_las_validas_y_reporta_cada_error(modulo_app, cliente, ordenes_activas):
+    activas = ordenes_activas()
+    ocs = sorted(activas)[-8:]
+    tareas = [t['id'] for t in activas[ocs[0]]['Tareas']]
+    operaciones = [
+        {'op': 'tarea', 'tarea_id': tareas[0], 'completado': True},
+        {'op': 'tarea', 'tarea_id': str(tareas[1]), 'completado': True},
+        {'op': 'estado', 'orden_compra': ocs[1], 'nuevo_estado': 'En Ruta'},
+        {'op': 'notas', 'orden_compra': ocs[2], 'notas': 'Llamar antes'},
+        {'op': 'agrupar', 'ordenes_compra': ocs[3:5]},
+        {'op': 'estado', 'orden_compra': 'NO-EXISTE', 'nuevo_estado': 'X'},
+        {'op': 'tarea', 'tarea_id': 99999999, 'completado': True},
+        {'op': 'borrar', 'orden_compra': ocs[5]},
+        'no es un objeto',
+        {'op': 'estado', 'orden_compra': [ocs[5]], 'nuevo_estado': 'X'},
+        {'op': 'tarea', 'tarea_id': tareas[2], 'completado': 'sí'},
+        {'op': ['estado']},
+    ]
+    respuesta = cliente.post('/api/lote', json={'operaciones': operaciones})
+    assert respuesta.status_code == 200
+    cuerpo, resultados = respuesta.get_json(), _resultados(respuesta)
+    assert cuerpo['success'] is False and cuerpo['aplicadas'] == 5
+    assert [resultados[i]['ok'] for i in range(5)] == [True] * 5
+    assert [resultados[i]['status'] for i in range(5, 12)] == [404, 404, 400, 400, 400, 400, 400]
+
+    assert _seguimiento(modulo_app, ocs[1]).estado == 'En Ruta'
+    assert _seguimiento(modulo_app, ocs[2]).notas == 'Llamar antes'
+    bloque_id = resultados[4]['bloque_id']
+    assert {_seguimiento(modulo_app, oc).bloque_id for oc in ocs[3:5]} == {bloque_id}
+    with modulo_app.app.app_context():
+        completadas = {t.id: t.completado for t in modulo_app.Tarea.query.filter(modulo_app.Tarea.id.in_(tareas[:3]))}
+    assert completadas == {tareas[0]: True, tareas[1]: True, tareas[2]: False}
+
+
+def test_estado_en_lote_se_aplica_a_todo_el_bloque(modulo_app, cliente, ordenes_activas):
+    ocs = sorted(ordenes_activas())[-12:-9]
+    agrupado = cliente.post('/api/lote', json={'operaciones': [{'op': 'agrupar', 'ordenes_compra': ocs}]})
+    assert agrupado.get_json()['success']
+    respuesta = cliente.post('/api/lote', json={'operaciones': [
+        {'op': 'estado', 'orden_compra': ocs[0], 'nuevo_estado': 'Entregado'}]})
+    assert sorted(_resultados(respuesta)[0]['updated_ocs']) == sorted(ocs)
+    assert {_seguimiento(modulo_app, oc).estado for oc in ocs} == {'Entregado'}
+
+
+def test_desagrupar_borra_el_bloque_vacio(modulo_app, cliente, ordenes_activas):
+    ocs = sorted(ordenes_activas())[-15:-13]
+    bloque_id = _resultados(cliente.post('/api/lote', json={'operaciones': [
+        {'op': 'agrupar', 'ordenes_compra': ocs}]}))[0]['bloque_id']
+    respuesta = cliente.post('/api/lote', json={'operaciones': [{'op': 'desagrupar', 'ocs': ocs}]})
+    assert respuesta.get_json()['success']
+    with modulo_app.app.app_context():
+        assert modulo_app.db.session.get(modulo_app.Bloque, bloque_id) is None
+
+
+def test_lote_atomico_no_aplica_nada_si_una_falla(modulo_app, cliente, ordenes_activas):
+    oc = sorted(ordenes_activas())[-16]
+    antes = _seguimiento(modulo_app, oc).notas
+    respuesta = cliente.post('/api/lote', json={'atomico': True, 'operaciones': [
+        {'op': 'notas', 'orden_compra': oc, 'notas': 'No debe quedar'},
+        {'op': 'estado', 'orden_compra': 'NO-EXISTE', 'nuevo_estado': 'X'},
+    ]})
+    assert respuesta.status_code == 400
+    assert respuesta.get_json()['aplicadas'] == 0
+    assert _seguimiento(modulo_app, oc).notas == antes
+
+
+def test_permisos_por_tipo_de_operacion(modulo_app, crear_cliente, ordenes_activas):
+    oc = sorted(ordenes_activas())[-17]
+    usuario = crear_cliente('lote@pruebas.local', rol='normal', permisos=['update_status'])
+    respuesta = usuario.post('/api/lote', json={'operaciones': [
+        {'op': 'estado', 'orden_compra': oc, 'nuevo_estado': 'Pendiente'},
+        {'op': 'notas', 'orden_compra': oc, 'notas': 'sin permiso'},
+        {'op': 'agrupar', 'ordenes_compra': [oc, oc]},
+    ]})
+    resultados = _resultados(respuesta)
+    assert resultados[0]['ok'] and _seguimiento(modulo_app, oc).estado == 'Pendiente'
+    assert (resultados[1]['status'], resultados[2]['status']) == (403, 403)
+    assert _seguimiento(modulo_app, oc).notas != 'sin permiso'
+
+
+def test_lote_invalido(cliente):
+    assert cliente.post('/api/lote', json={}).status_code == 400
+    assert cliente.post('/api/lote', json={'operaciones': []}).status_code == 400
+    assert cliente.post('/api/lote', json={'operaciones': {'op': 'estado'}}).status_code == 400
+    demasiadas = [{'op': 'estado', 'orden_compra': 'X', 'nuevo_estado': 'Y'}] * 501
+    assert cliente.post('/api/lote', json={'operaciones': demasiadas}).status_code == 400
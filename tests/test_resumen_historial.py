@@ -0,0 +1,67 @@
+"""Resumen del historial: lo que mantienen archivar y liberar es igual a reconstruirlo desde cero."""
+from datetime import datetime
+
+AGRUPAR = 'dia,canal,cliente,estado_final'
+
+
+def _resumen(cliente, filtros=None):
+    respuesta = cliente.get('/api/historial/resumen', query_string={'agrupar': AGRUPAR, **(filtros or {})})
+    assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+    return respuesta.get_json()
+
+
+def _reconstruir(modulo_app):
+    with modulo_app.app.app_context():
+        modulo_app.reconstruir_resumen_historial()
+
+
+def _archivar(cliente, ordenes):
+    respuesta = cliente.post('/api/archivar-bloque', json={'orders_data': ordenes})
+    assert respuesta.status_code == 200 and all(r['ok'] for r in respuesta.get_json()['resultados'])
+
+
+def test_archivar_y_liberar_coinciden_con_la_reconstruccion(modulo_app, cliente, ordenes_activas):
+    A = modulo_app
+    _reconstruir(A)
+    # Subtotales que en float no suman exacto (0.1 + 0.2) en el mismo grupo.
+    _archivar(cliente, [
+        {'Orden de compra': f'RES-{i}', 'Cliente': 'CASA LEY', 'Canal': 'Mayoreo', 'Estado': 'Entregado',
+         'No. Botellas': '12', 'No. Cajas': '1', 'Subtotal': subtotal}
+        for i, subtotal in enumerate(['0.1', '0.2', '1.005', '2.675'])
+    ])
+    activas = ordenes_activas()
+    _archivar(cliente, [{**activas[oc], 'Estado': 'Entregado'} for oc in sorted(activas)[11:14]])
+    with A.app.app_context():
+        historial_id = A.HistorialOrden.query.filter_by(orden_compra='RES-1').one().id
+    assert cliente.post(f'/api/orden/liberar/{historial_id}').status_code == 200
+
+    incremental = _resumen(cliente)
+    _reconstruir(A)
+    assert incremental == _resumen(cliente)
+
+    hoy = datetime.utcnow().date().isoformat()
+    grupo = _resumen(cliente, {'canal': 'Mayoreo', 'cliente': 'CASA LEY', 'start_date': hoy, 'end_date': hoy})['totales']
+    assert grupo['ordenes'] == 3 and grupo['no_botellas'] == 36
+    assert grupo['subtotal'] == round(0.1 + 1.005 + 2.675, 2)
+
+
+def test_ordenes_sin_fecha_no_entran_al_resumen(modulo_app, cliente):
+    A = modulo_app
+    with A.app.app_context():
+        A.db.session.add(A.HistorialOrden(orden_compra='RES-SIN-FECHA', cliente='CASA LEY', canal='Mayoreo',
+                                          estado_final='Entregado', no_botellas=5, subtotal=10.0))
+        A.db.session.flush()
+        A.HistorialOrden.query.filter_by(orden_compra='RES-SIN-FECHA').update({'fecha_archivado': None})
+        A.db.session.commit()
+        historial_id = A.HistorialOrden.query.filter_by(orden_compra='RES-SIN-FECHA').one().id
+    antes = _resumen(cliente)
+    _reconstruir(A)
+    assert _resumen(cliente) == antes
+    # Liberarla tampoco resta nada de ningún grupo.
+    assert cliente.post(f'/api/orden/liberar/{historial_id}').status_code == 200
+    assert _resumen(cliente) == antes
+
+
+def test_agrupacion_invalida(cliente):
+    assert cliente.get('/api/historial/resumen?agrupar=so').status_code == 400
+    assert cliente.get('/api/historial/resumen?start_date=ayer').status_code == 400